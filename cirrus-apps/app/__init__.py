@@ -2,11 +2,14 @@ import secrets
 from pathlib import Path
 
 from flask import Flask
+from flask_caching import Cache
 from flask_session import Session
 
+from .json_provider import OrjsonProvider
 from .routes.chart_generator import chart_generator_bp
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.app_context().push()
 app.register_blueprint(chart_generator_bp)
 
@@ -26,6 +29,9 @@ app.config['SESSION_TYPE'] = 'filesystem'
 
 Session(app)
 
+app.config['CACHE_TYPE'] = 'SimpleCache'
+cache = Cache(app)
+
 from app.main import views
 from app.jira import views
 from app.metrics import views
\ No newline at end of file
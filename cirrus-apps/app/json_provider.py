@@ -0,0 +1,27 @@
+"""
+Flask JSON provider backed by orjson
+Used for jsonify() responses and request.json parsing across the app.
+"""
+import orjson
+from flask import current_app
+from flask.json.provider import JSONProvider
+
+
+class OrjsonProvider(JSONProvider):
+    """Serialize and parse JSON with orjson instead of the standard library"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str.
+        # Arguments follow jsonify(): one value as-is, several as a list, or keywords as a dict
+        if args and kwargs:
+            raise TypeError("jsonify() behavior undefined when passed both args and kwargs")
+        obj = args[0] if len(args) == 1 else list(args) or kwargs or None
+        return current_app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json'
+        )
@@ -1,12 +1,63 @@
-from flask import render_template, request, session, jsonify 
-from app import app
+from flask import render_template, request, make_response
+from app import app, cache
 import yaml
-import json
-from ..metrics.github_metrics import get_cpu_hours
+import orjson
+import copy
+import functools
+import hashlib
 import os
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from werkzeug.http import parse_options_header
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Shared across requests and threads so connections to uptime-kuma and the docs
+# site are kept alive and reused. Read errors are not retried so a hung upstream
+# costs a single timeout.
+HTTP_SESSION = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                            max_retries=Retry(total=2, read=False, backoff_factor=0.2))
+HTTP_SESSION.mount('http://', _http_adapter)
+HTTP_SESSION.mount('https://', _http_adapter)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path, mtime):
+    if path.endswith('.json'):
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def load_config(path):
+    """Parse a YAML config file, re-reading it only when its mtime changes
+
+    The image build converts the YAML configs to JSON, which parses much faster,
+    so a JSON copy next to the YAML file is used as long as it is not stale.
+    """
+    json_path = os.path.splitext(path)[0] + '.json'
+    if os.path.exists(json_path) and os.path.getmtime(json_path) >= os.path.getmtime(path):
+        path = json_path
+    return _parse_config(path, os.path.getmtime(path))
+
+
+APPS_YAML_PATH = os.path.join(app.root_path, 'apps.yaml')
+STATUS_YAML_PATH = os.path.join(app.root_path, 'status_monitors.yaml')
+
+# Parse the config files at startup so no request pays for the first load;
+# load_config() still picks up edits through the mtime check
+for _config_file in (APPS_YAML_PATH, STATUS_YAML_PATH):
+    load_config(_config_file)
 
 @app.route('/')
 def home():
@@ -21,122 +72,207 @@ def getting_started():
     return render_template('getting-started.html')
 
 @app.route('/apps')
+@cache.cached(timeout=300)
 def apps():
-    apps_file = os.path.join(app.root_path, 'apps.yaml')
-    with open(apps_file, 'r') as f:
-        applications = yaml.safe_load(f)
+    applications = load_config(APPS_YAML_PATH)
     
     return render_template('apps.html', applications=applications)
     
-@app.route('/status')
-def status():
-    status_file = os.path.join(app.root_path, 'status_monitors.yaml')
-    with open(status_file, 'r') as f:
-        config = yaml.safe_load(f)
+STATUS_FETCH_WORKERS = 16
+
+# One pool for badge requests across all status pages, so concurrent badge fetches
+# (and their pooled connections) stay bounded however many pages are checked
+BADGE_EXECUTOR = ThreadPoolExecutor(max_workers=STATUS_FETCH_WORKERS, thread_name_prefix='badge')
+
+
+def fetch_monitor_status(uptime_kuma_url, monitor):
+    """Return the badge status of a single monitor, or None if the badge is unavailable"""
+    badge_url = f"{uptime_kuma_url}/api/badge/{monitor.get('id')}/status"
+    try:
+        badge_response = HTTP_SESSION.get(badge_url, timeout=3)
+    except requests.RequestException:
+        app.logger.warning("Could not fetch badge for monitor %s", monitor.get('id'))
+        return None
+    
+    if badge_response.status_code != 200:
+        return None
     
-    # Fetch status from each status page
-    for page in config['status_pages']:
-        try:
-            status_url = f"{config['uptime_kuma_url']}/status/{page['slug']}"
-            response = requests.get(status_url, timeout=5)
+    # Match on the raw SVG bytes to skip decoding the badge to text
+    badge_content = badge_response.content
+    if b'>Up<' in badge_content:
+        return 'UP'
+    elif b'>Down<' in badge_content:
+        return 'DOWN'
+    return 'UNKNOWN'
+
+
+def fetch_page_status(uptime_kuma_url, page):
+    """Fill in the overall status and per-monitor status of a status page"""
+    try:
+        # The status page API returns the same monitor groups the HTML page embeds
+        status_url = f"{uptime_kuma_url}/api/status-page/{page['slug']}"
+        response = HTTP_SESSION.get(status_url, timeout=5)
+        
+        if response.status_code == 200:
+            page_data = orjson.loads(response.content)
+            
+            page['status'] = 'UP'
+            page['monitors'] = []
             
-            if response.status_code == 200:
-                import re
-                match = re.search(r"window\.preloadData = (\{.*?\});", response.text)
+            monitors = [monitor
+                        for group in page_data.get('publicGroupList', [])
+                        for monitor in group.get('monitorList', [])]
                 
-                if match:
-                    json_str = match.group(1)
-                    json_str = json_str.replace("'", '"').replace('null', 'null').replace('True', 'true').replace('False', 'false')
-                    preload_data = json.loads(json_str)
+            # Badge requests are independent, so fetch them concurrently and
+            # stop as soon as one monitor is down since the page is down either way
+            futures = {BADGE_EXECUTOR.submit(fetch_monitor_status, uptime_kuma_url, monitor): monitor
+                       for monitor in monitors}
+            try:
+                for future in as_completed(futures):
+                    monitor_status = future.result()
+                    if monitor_status is None:
+                        page['status'] = 'UNKNOWN'
+                        continue
                     
-                    page['status'] = 'UP'
-                    page['monitors'] = []
+                    page['monitors'].append({
+                        'name': futures[future].get('name'),
+                        'status': monitor_status
+                    })
                     
-                    for group in preload_data.get('publicGroupList', []):
-                        for monitor in group.get('monitorList', []):
-                            monitor_id = monitor.get('id')
-                            monitor_name = monitor.get('name')
-                            
-                            badge_url = f"{config['uptime_kuma_url']}/api/badge/{monitor_id}/status"
-                            badge_response = requests.get(badge_url, timeout=3)
-                            
-                            if badge_response.status_code == 200:
-                                badge_text = badge_response.text
-                                if '>Up<' in badge_text:
-                                    monitor_status = 'UP'
-                                elif '>Down<' in badge_text:
-                                    monitor_status = 'DOWN'
-                                else:
-                                    monitor_status = 'UNKNOWN'
-                                
-                                page['monitors'].append({
-                                    'name': monitor_name,
-                                    'status': monitor_status
-                                })
-                                
-                                if monitor_status == 'DOWN':
-                                    page['status'] = 'DOWN'
-                            else:
-                                page['status'] = 'UNKNOWN'
-                else:
-                    page['status'] = 'UNKNOWN'
-            else:
-                page['status'] = 'UNKNOWN'
-                
-        except Exception as e:
-            print(f"Exception for {page['name']}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+                    if monitor_status == 'DOWN':
+                        page['status'] = 'DOWN'
+                        break
+            finally:
+                # Drop this page's badge requests that have not started yet
+                for future in futures:
+                    future.cancel()
+        else:
             page['status'] = 'UNKNOWN'
+            
+    except Exception:
+        app.logger.exception("Exception fetching status for %s", page['name'])
+        page['status'] = 'UNKNOWN'
+
+
+@cache.cached(timeout=30, key_prefix='status_page', unless=lambda: request.args.get('force'))
+def build_status_page():
+    """Check every status page and return the rendered page along with its ETag"""
+    # Deep copy since the per-page status is written into the config below
+    config = copy.deepcopy(load_config(STATUS_YAML_PATH))
+    
+    # Fetch status from all status pages concurrently
+    pages = config['status_pages']
+    if pages:
+        with ThreadPoolExecutor(max_workers=min(len(pages), STATUS_FETCH_WORKERS)) as executor:
+            list(executor.map(
+                functools.partial(fetch_page_status, config['uptime_kuma_url']), pages))
     
     config['last_check'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S MST')
+    
+    etag = hashlib.md5(str((config['last_check'],
+                            sorted((page['name'], page['status']) for page in pages))).encode()).hexdigest()
 
     # Metrics are now loaded asynchronously via the /metrics endpoint
-    return render_template('status.html', config=config)
+    return render_template('status.html', config=config), etag
 
 
-@app.route('/sla')
-def sla():
+@app.route('/status')
+def status():
+    content_html, etag = build_status_page()
+    
+    # Let auto-refreshing clients revalidate instead of re-downloading an unchanged page
+    response = make_response(content_html)
+    response.set_etag(etag, weak=True)
+    return response.make_conditional(request)
+
+
+SLA_URL = 'https://ncar-hpc-docs.readthedocs.io/en/latest/compute-systems/cirrus/guides/09-service-level-agreements/slas/'
+
+# Validators and extracted article from the last successful SLA fetch
+_sla_cache = {'etag': None, 'last_modified': None, 'html': None}
+
+# Edit buttons, heading permalinks and the page footer aside inside the article
+SLA_STRIP_XPATH = (
+    ".//a[contains(concat(' ', normalize-space(@class), ' '), ' md-content__button ')]"
+    " | .//*[contains(concat(' ', normalize-space(@class), ' '), ' headerlink ')]"
+    " | .//aside"
+)
+
+
+def find_sla_article(response):
+    """Stream the SLA page into lxml and return the md-content__inner article
+
+    Parsing stops as soon as the article is closed, so the rest of the page
+    is neither downloaded into memory nor parsed.
+    """
+    # Only pass a charset the server declared; otherwise lxml sniffs the <meta charset>
+    _, content_type_options = parse_options_header(response.headers.get('Content-Type'))
+    parser = etree.HTMLPullParser(events=('end',), tag='article',
+                                  encoding=content_type_options.get('charset'))
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+    
+    for chunk in response.iter_content(chunk_size=16384):
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if 'md-content__inner' in element.classes:
+                return element
+    return None
+
+
+# Failed fetches return None, which flask_caching does not treat as a cache hit
+@cache.memoize(timeout=3600)
+def fetch_sla_content():
+    """Fetch the SLA page from the CIRRUS docs and return the cleaned article HTML"""
     try:
-        url = 'https://ncar-hpc-docs.readthedocs.io/en/latest/compute-systems/cirrus/guides/09-service-level-agreements/slas/'
-        print(f"Fetching SLA from: {url}")
+        url = SLA_URL
+        app.logger.debug("Fetching SLA from: %s", url)
         
-        response = requests.get(url, timeout=10)
-        print(f"Response status code: {response.status_code}")
+        # Revalidate the last fetch so an unchanged page comes back as a bodiless 304
+        headers = {}
+        if _sla_cache['etag']:
+            headers['If-None-Match'] = _sla_cache['etag']
+        if _sla_cache['last_modified']:
+            headers['If-Modified-Since'] = _sla_cache['last_modified']
         
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the article tag with class md-content__inner
-            article = soup.find('article', class_='md-content__inner')
+        with HTTP_SESSION.get(url, headers=headers, timeout=10, stream=True) as response:
+            app.logger.debug("Response status code: %s", response.status_code)
             
-            if article:
-                # Remove unwanted elements
-                for element in article.find_all(['a'], class_='md-content__button'):
-                    element.decompose()
+            if response.status_code == 304:
+                content_html = _sla_cache['html']
+            elif response.status_code == 200:
+                # Find the article tag with class md-content__inner
+                article = find_sla_article(response)
                 
-                for element in article.find_all(class_='headerlink'):
-                    element.decompose()
-                
-                for element in article.find_all('aside'):
-                    element.decompose()
-                
-                # Get the content
-                content_html = str(article)
-                print(f"Content extracted, length: {len(content_html)}")
+                if article is not None:
+                    # Remove unwanted elements in a single pass
+                    for element in article.xpath(SLA_STRIP_XPATH):
+                        element.drop_tree()
+                    
+                    # Get the content
+                    content_html = lxml.html.tostring(article, encoding='unicode', with_tail=False)
+                    app.logger.debug("Content extracted, length: %d", len(content_html))
+                    
+                    _sla_cache.update(
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                        html=content_html
+                    )
+                else:
+                    app.logger.warning("Could not find article element")
+                    content_html = None
             else:
-                print("Could not find article element")
                 content_html = None
-        else:
-            content_html = None
-            print(f"Failed to fetch: status {response.status_code}")
-    except Exception as e:
-        print(f"Exception fetching SLA: {str(e)}")
-        import traceback
-        traceback.print_exc()
+                app.logger.warning("Failed to fetch SLA: status %s", response.status_code)
+    except Exception:
+        app.logger.exception("Exception fetching SLA")
         content_html = None
     
-    return render_template('sla.html', content_html=content_html)
+    return content_html
+
+
+@app.route('/sla')
+def sla():
+    return render_template('sla.html', content_html=fetch_sla_content())
 
 @app.route('/templates/navbar.html')
 def navbar():
@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 import requests
 
 MIMIR_URL = os.getenv(
@@ -32,7 +32,7 @@ def get_cpu_hours():
         )
 
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         results = {}
         total = 0
@@ -62,8 +62,8 @@ def main():
 
     print("Metrics:", metrics)
 
-    with open("cirrus-apps/app/static/runner_metrics.json", "w") as f:
-        json.dump(metrics, f, indent=2)
+    with open("cirrus-apps/app/static/runner_metrics.json", "wb") as f:
+        f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
 
 
 if __name__ == "__main__":
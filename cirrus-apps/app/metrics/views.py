@@ -1,4 +1,4 @@
-import json
+import orjson
 import os
 import threading
 from datetime import datetime, timedelta
@@ -27,8 +27,8 @@ def regenerate_metrics():
         "cpu_hours": cpu_data
     }
     os.makedirs(os.path.dirname(METRICS_FILE), exist_ok=True)
-    with open(METRICS_FILE, "w") as f:
-        json.dump(metrics, f, indent=2)
+    with open(METRICS_FILE, "wb") as f:
+        f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
     return metrics
 
 
@@ -46,21 +46,19 @@ def regenerate_metrics_background():
 
 @app.route("/metrics")
 def metrics():
-    global _metrics_generating
-
     if metrics_are_stale():
         thread = threading.Thread(target=regenerate_metrics_background, daemon=True)
         thread.start()
 
         # Stale file exists — return it with a flag so the UI can show a warning and re-poll
         if os.path.exists(METRICS_FILE):
-            with open(METRICS_FILE, "r") as f:
-                data = json.load(f)
+            with open(METRICS_FILE, "rb") as f:
+                data = orjson.loads(f.read())
             data["stale"] = True
             return jsonify(data)
 
         # No file at all — return 202 so the UI knows to keep polling
         return jsonify({"generating": True}), 202
 
-    with open(METRICS_FILE, "r") as f:
-        return jsonify(json.load(f))
\ No newline at end of file
+    with open(METRICS_FILE, "rb") as f:
+        return jsonify(orjson.loads(f.read()))
\ No newline at end of file
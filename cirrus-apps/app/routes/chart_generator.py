@@ -1,8 +1,15 @@
+import collections
+import functools
 import os
-import io
+import re
+import time
 import zipfile
-from flask import Blueprint, render_template, request, send_file, jsonify
-from github import Github, GithubException
+from datetime import datetime
+from string import Template
+from flask import Blueprint, Response, render_template, request, jsonify
+from github import Github, InputGitTreeElement
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from werkzeug.exceptions import RequestEntityTooLarge
 from .helm_helpers import generate_helpers_tpl
 
 chart_generator_bp = Blueprint('chart_generator', __name__)
@@ -37,6 +44,100 @@ AVAILABLE_ADDONS = {
     }
 }
 
+# Limits on what the generator form may submit
+MAX_REQUEST_BYTES = 64 * 1024
+MAX_FIELD_LENGTH = 256
+APP_NAME_PATTERN = re.compile(r'[a-z0-9-]{1,63}')
+
+# Default cluster domain for app hostnames
+K8S_DOMAIN = '.k8s.ucar.edu'
+
+# Display name of each add-on, for PR descriptions
+ADDON_NAMES = {k: v['name'] for k, v in AVAILABLE_ADDONS.items()}
+
+# Add-on fields coerced from their form values
+INT_FIELDS = frozenset({'cnpg_instances', 'worker_replicas', 'worker_threads'})
+BOOL_FIELDS = frozenset({'cnpg_backup_enabled', 'nfs_readonly', 'cnpg_enable_superuser'})
+
+# YAML spelling of boolean flags
+BOOL_STR = {True: 'true', False: 'false'}
+
+
+def coerce_int(value):
+    return int(value) if value else None
+
+
+def coerce_bool(value):
+    return value == 'true' if isinstance(value, str) else bool(value)
+
+
+def keep_value(value):
+    return value
+
+
+# How each add-on field is read from the request, built once from the add-on definitions
+ADDON_FIELD_COERCERS = {
+    field: coerce_int if field in INT_FIELDS else coerce_bool if field in BOOL_FIELDS else keep_value
+    for field in [*(f for addon in AVAILABLE_ADDONS.values() for f in addon['fields']), *BOOL_FIELDS]
+}
+
+# Fields the generators use as text; numbers and checkboxes are coerced separately
+STR_FIELDS = frozenset({
+    'image', 'domain', 'ingress_type', 'webapp_path', 'output_format',
+    'github_token', 'github_repo', 'github_branch',
+    *(field for field, coerce in ADDON_FIELD_COERCERS.items() if coerce is keep_value)
+})
+
+# Defaults for add-on settings the user left out of the form
+ADDON_DEFAULTS = {
+    'cnpg_instances': 3,
+    'cnpg_storage_size': '20Gi',
+    'cnpg_app_owner': 'app_user',
+    'cnpg_app_secret_path': 'secret/data/myapp/db',
+    'cnpg_app_password_key': 'password',
+    'worker_replicas': 3,
+    'worker_threads': 4,
+    'worker_memory': '4Gi',
+    'pv_access_mode': 'ReadWriteOnce',
+    'pv_storage_size': '10Gi',
+    'pv_mount_path': '/data',
+    'nfs_server': 'nfs.example.com',
+    'nfs_path': '/export/data',
+    'nfs_mount_path': '/mnt/nfs',
+    'nfs_readonly': False,
+    'secret_path': 'secret/data/myapp'
+}
+
+
+def validate_helm_request(data):
+    """Return an error message if the submitted form cannot be generated, otherwise None"""
+    if not isinstance(data, dict):
+        return 'Request body must be a JSON object'
+    
+    if not data.get('app_name') or not data.get('image'):
+        return 'App name and image are required'
+    
+    if not isinstance(data['app_name'], str) or not APP_NAME_PATTERN.fullmatch(data['app_name']):
+        return 'App name may only contain lowercase letters, numbers and hyphens (63 characters at most)'
+    
+    enabled_addons = data.get('enabled_addons', [])
+    if not isinstance(enabled_addons, list) or not all(
+        isinstance(addon, str) and addon in AVAILABLE_ADDONS for addon in enabled_addons
+    ):
+        return 'Unknown add-on selected'
+    
+    for key, value in data.items():
+        if key == 'enabled_addons':
+            continue
+        if key in STR_FIELDS and not isinstance(value, str):
+            return f'Invalid value for {key}'
+        if isinstance(value, (list, dict)):
+            return f'Invalid value for {key}'
+        if isinstance(value, str) and len(value) > MAX_FIELD_LENGTH:
+            return f'{key} is too long'
+    
+    return None
+
 
 @chart_generator_bp.route('/helm-generator')
 def helm_generator():
@@ -47,55 +148,65 @@ def helm_generator():
 @chart_generator_bp.route('/api/generate-helm', methods=['POST'])
 def generate_helm():
     """Generate modular Helm chart based on selected add-ons"""
-    data = request.json
+    # Reject oversized or malformed input before any of it reaches the generators;
+    # Werkzeug stops reading the body at the limit, chunked or not
+    request.max_content_length = MAX_REQUEST_BYTES
+    try:
+        data = request.get_json(silent=True)
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Request is too large'}), 413
+    error = validate_helm_request(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
     output_format = data.get('output_format', 'zip')
     
-    # Extract base app config
-    app_config = {
-        'app_name': data.get('app_name'),
-        'image': data.get('image'),
-        'replicas': int(data.get('replicas', 2)),
-        'port': int(data.get('port', 8080)),
-        'enable_ingress': data.get('enable_ingress', False),
-        'ingress_type': data.get('ingress_type', 'external'),
-        'domain': data.get('domain', ''),
-        'webapp_path': data.get('webapp_path', '/')
-    }
+    try:
+        # Extract base app config
+        app_config = {
+            'app_name': data.get('app_name'),
+            'image': data.get('image'),
+            'replicas': int(data.get('replicas', 2)),
+            'port': int(data.get('port', 8080)),
+            'enable_ingress': data.get('enable_ingress', False),
+            'ingress_type': data.get('ingress_type', 'external'),
+            'domain': data.get('domain', ''),
+            'webapp_path': data.get('webapp_path', '/')
+        }
+        
+        # Extract and coerce the add-on field values that were submitted, falling back to the defaults
+        addon_config = collections.ChainMap(
+            {k: coerce(data[k]) for k, coerce in ADDON_FIELD_COERCERS.items() if k in data},
+            ADDON_DEFAULTS
+        )
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Replica, port and count fields must be whole numbers'}), 400
     
     # Extract enabled add-ons
     enabled_addons = data.get('enabled_addons', [])
     
-    # Extract all field values
-    addon_config = {}
-    for k, v in data.items():
-        if k not in ['app_name', 'image', 'replicas', 'port', 
-                     'enable_ingress', 'ingress_type', 'domain', 'enabled_addons', 
-                     'output_format', 'github_token', 'github_repo', 'github_branch']:
-            # Convert numeric fields to int
-            if k in ['cnpg_instances', 'worker_replicas', 'worker_threads']:
-                addon_config[k] = int(v) if v else None
-            # Convert boolean fields
-            elif k in ['cnpg_backup_enabled', 'nfs_readonly', 'cnpg_enable_superuser']:
-                addon_config[k] = v == 'true' if isinstance(v, str) else bool(v)
-            else:
-                addon_config[k] = v
-    
-    # Validate required fields
-    if not app_config['app_name'] or not app_config['image']:
-        return jsonify({'error': 'App name and image are required'}), 400
+    # Derived once here and shared by the values.yaml and README generators
+    image_repo, has_tag, image_tag = app_config['image'].rpartition(':')
+    if has_tag:
+        app_config['image_repo'], app_config['image_tag'] = image_repo, image_tag
+    else:
+        app_config['image_repo'], app_config['image_tag'] = image_tag, 'latest'
+    if app_config['enable_ingress']:
+        fqdn = app_config['domain']
+        app_config['host'] = fqdn[:-len(K8S_DOMAIN)] if fqdn.endswith(K8S_DOMAIN) else fqdn.split('.', 1)[0]
     
-    # Generate Helm chart files
-    chart_files = generate_modular_chart(app_config, enabled_addons, addon_config)
+    # Generate Helm chart files, reusing an identical earlier request's output
+    chart_files = chart_files_for(app_config, enabled_addons, addon_config)
     
     if output_format == 'zip':
-        # Create ZIP file
-        zip_buffer = create_zip(chart_files, app_config['app_name'])
-        return send_file(
-            zip_buffer,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=f"{app_config['app_name']}-helm-chart.zip"
+        # Stream the ZIP file as it is written
+        response = Response(create_zip(chart_files, app_config['app_name']), mimetype='application/zip')
+        response.headers.set(
+            'Content-Disposition',
+            'attachment',
+            filename=f"{app_config['app_name']}-helm-chart.zip"
         )
+        return response
     
     elif output_format == 'github_pr':
         # Create GitHub PR
@@ -115,51 +226,66 @@ def generate_helm():
     return jsonify({'error': 'Invalid output format'}), 400
 
 
-def generate_modular_chart(app_config, enabled_addons, addon_config):
-    """Generate modular Helm chart with base app + selected add-ons"""
-    files = {}
+def iter_modular_chart(app_config, enabled_addons, addon_config):
+    """Yield (path, UTF-8 content) for each file of the modular Helm chart, in archive order"""
+    enabled_addons = frozenset(enabled_addons)
     app_name = app_config['app_name']
     
     # Chart.yaml
-    files['Chart.yaml'] = generate_chart_yaml(app_name)
+    yield 'Chart.yaml', chart_yaml_bytes(app_name)
     
     # values.yaml with all enabled components
-    files['values.yaml'] = generate_modular_values(app_config, enabled_addons, addon_config)
+    yield 'values.yaml', generate_modular_values(app_config, enabled_addons, addon_config).encode()
     
     # templates/_helpers.tpl
-    files['templates/_helpers.tpl'] = generate_helpers_tpl()
+    yield 'templates/_helpers.tpl', HELPERS_TPL_BYTES
     
     # Base templates (always included)
-    files['templates/deployment.yaml'] = generate_base_deployment(app_config, enabled_addons, addon_config)
-    files['templates/service.yaml'] = generate_service()
+    yield 'templates/deployment.yaml', generate_base_deployment(app_config, enabled_addons, addon_config).encode()
+    yield 'templates/service.yaml', SERVICE_YAML_BYTES
     
     # Conditional templates based on enabled add-ons
     if app_config['enable_ingress']:
-        files['templates/ingress.yaml'] = generate_ingress()
-    
-    if 'cnpg' in enabled_addons:
-        files['templates/cnpg-cluster.yaml'] = generate_cnpg_cluster()
-        files['templates/cnpg-app-user-secret.yaml'] = generate_cnpg_app_user_secret()
+        yield 'templates/ingress.yaml', INGRESS_YAML_BYTES
     
-    if 'dask' in enabled_addons:
-        files['templates/dask-scheduler-deployment.yaml'] = generate_dask_scheduler()
-        files['templates/dask-scheduler-service.yaml'] = generate_dask_scheduler_service()
-        files['templates/dask-workers-deployment.yaml'] = generate_dask_workers()
-    
-    if 'persistence' in enabled_addons:
-        files['templates/pvc.yaml'] = generate_pvc()
-    
-    if 'nfs' in enabled_addons:
-        files['templates/nfs-pv.yaml'] = generate_nfs_pv()
-        files['templates/nfs-pvc.yaml'] = generate_nfs_pvc()
-    
-    if 'external_secrets' in enabled_addons:
-        files['templates/external-secret.yaml'] = generate_external_secret()
+    for addon, templates in ADDON_TEMPLATES.items():
+        if addon in enabled_addons:
+            yield from templates
     
     # README
-    files['README.md'] = generate_modular_readme(app_config, enabled_addons, addon_config)
-    
-    return files
+    yield 'README.md', generate_modular_readme(app_config, enabled_addons, addon_config).encode()
+
+
+def chart_files_for(app_config, enabled_addons, addon_config):
+    """Return the chart files for these settings, from the cache when the same chart was generated before"""
+    return build_chart_files(
+        typed_items(app_config),
+        frozenset(enabled_addons),
+        typed_items(addon_config.maps[0]),
+        generated_date()
+    )
+
+
+def typed_items(mapping):
+    """Items of a mapping with each value's type, so 1, 1.0 and True are separate cache keys"""
+    return tuple((key, type(value), value) for key, value in mapping.items())
+
+
+@functools.lru_cache(maxsize=256)
+def build_chart_files(app_items, enabled_addons, addon_items, date):
+    """Build and keep the chart files for one set of settings
+
+    date is only part of the cache key, so READMEs pick up the new date after midnight.
+    """
+    app_config = {key: value for key, _, value in app_items}
+    addon_config = collections.ChainMap({key: value for key, _, value in addon_items}, ADDON_DEFAULTS)
+    return tuple(iter_modular_chart(app_config, enabled_addons, addon_config))
+
+
+@functools.lru_cache(maxsize=256)
+def chart_yaml_bytes(app_name):
+    """Encoded Chart.yaml, cached per app name"""
+    return generate_chart_yaml(app_name).encode()
 
 
 def generate_chart_yaml(app_name):
@@ -172,260 +298,258 @@ version: 0.1.0
 appVersion: "1.0"
 """
 
-def generate_modular_values(app_config, enabled_addons, addon_config):
-    """Generate values.yaml with only enabled components"""
-    image_parts = app_config['image'].rsplit(':', 1)
-    image = image_parts[0]
-    tag = image_parts[1] if len(image_parts) > 1 else 'latest'
-    
-    values = f"""# Modular Helm Chart for {app_config['app_name']}
+# values.yaml sections, compiled once and filled in with Template.substitute
+VALUES_BASE_TEMPLATE = Template("""# Modular Helm Chart for ${app_name}
 # Generated by CIRRUS Helm Chart Generator
 
 # Number of pod replicas
 # We recommend 2+ for zero-downtime deployments during server maintenance
-replicaCount: {app_config['replicas']}
+replicaCount: ${replicas}
 
 webapp:
-  name: {app_config['app_name']}
-  group: {app_config['app_name']}
+  name: ${app_name}
+  group: ${app_name}
   container:
-    image: {image}:{tag}
-    port: {app_config['port']}
+    image: ${image_repo}:${image_tag}
+    port: ${port}
     memory: 1G
     cpu: 2
-"""
-    
-    # Add ingress config if enabled
-    if app_config['enable_ingress']:
-        fqdn = app_config.get('domain', '')
-        path = app_config.get('webapp_path', '/')
-        host = fqdn.replace('.k8s.ucar.edu', '') if '.k8s.ucar.edu' in fqdn else fqdn.split('.')[0]
-        access_type = app_config.get('ingress_type', 'external')
-        
-        values += f"""  path: {path}
+""")
+
+VALUES_INGRESS_TEMPLATE = Template("""  path: ${webapp_path}
   tls:
-    fqdn: {fqdn}
-    secretName: incommon-cert-{host}
+    fqdn: ${domain}
+    secretName: incommon-cert-${host}
 
 ingress:
   enabled: true
-  access: {access_type}  # 'external' for public access, 'internal' for UCAR network only
-"""
-    
-    # Add CNPG config
-    if 'cnpg' in enabled_addons:
-        values += f"""
+  access: ${ingress_type}  # 'external' for public access, 'internal' for UCAR network only
+""")
+
+VALUES_CNPG_TEMPLATE = Template("""
 cnpg:
   enabled: true
-  instances: {addon_config.get('cnpg_instances', 3)}
+  instances: ${cnpg_instances}
   storage:
-    size: {addon_config.get('cnpg_storage_size', '20Gi')}
+    size: ${cnpg_storage_size}
   
   # App user credentials from External Secrets
   appUser:
-    owner: {addon_config.get('cnpg_app_owner', 'app_user')}
-    secretPath: {addon_config.get('cnpg_app_secret_path', 'secret/data/myapp/db')}
-    passwordKey: {addon_config.get('cnpg_app_password_key', 'password')}
-"""
-    
-    # Add Dask config
-    if 'dask' in enabled_addons:
-        values += f"""
+    owner: ${cnpg_app_owner}
+    secretPath: ${cnpg_app_secret_path}
+    passwordKey: ${cnpg_app_password_key}
+""")
+
+VALUES_DASK_TEMPLATE = Template("""
 dask:
   enabled: true
   scheduler:
     port: 8786
     dashboardPort: 8787
   worker:
-    replicas: {addon_config.get('worker_replicas', 3)}
-    threads: {addon_config.get('worker_threads', 4)}
-    memory: {addon_config.get('worker_memory', '4Gi')}
-"""
-    
-    # Add Persistence config
-    if 'persistence' in enabled_addons:
-        values += f"""
+    replicas: ${worker_replicas}
+    threads: ${worker_threads}
+    memory: ${worker_memory}
+""")
+
+VALUES_PERSISTENCE_TEMPLATE = Template("""
 persistence:
   enabled: true
   storageClass: ceph-kubepv
-  accessMode: {addon_config.get('pv_access_mode', 'ReadWriteOnce')}
-  size: {addon_config.get('pv_storage_size', '10Gi')}
-  mountPath: {addon_config.get('pv_mount_path', '/data')}
-"""
-    
-    # Add NFS config
-    if 'nfs' in enabled_addons:
-        readonly = addon_config.get('nfs_readonly', False)
-        values += f"""
+  accessMode: ${pv_access_mode}
+  size: ${pv_storage_size}
+  mountPath: ${pv_mount_path}
+""")
+
+VALUES_NFS_TEMPLATE = Template("""
 nfs:
   enabled: true
-  server: {addon_config.get('nfs_server', 'nfs.example.com')}
-  path: {addon_config.get('nfs_path', '/export/data')}
-  mountPath: {addon_config.get('nfs_mount_path', '/mnt/nfs')}
-  readOnly: {str(readonly).lower()}
-"""
-    
-    # Add External Secrets config
-    if 'external_secrets' in enabled_addons:
-        values += f"""
+  server: ${nfs_server}
+  path: ${nfs_path}
+  mountPath: ${nfs_mount_path}
+  readOnly: ${nfs_readonly_str}
+""")
+
+VALUES_EXTERNAL_SECRETS_TEMPLATE = Template("""
 externalSecrets:
   enabled: true
-  secretPath: {addon_config.get('secret_path', 'secret/data/myapp')}
+  secretPath: ${secret_path}
   backend: vault
   vaultUrl: https://bao.k8s.ucar.edu
-"""
-    
-    return values
+""")
+
+# values.yaml section for each add-on, in file order
+VALUES_ADDON_TEMPLATES = {
+    'cnpg': VALUES_CNPG_TEMPLATE,
+    'dask': VALUES_DASK_TEMPLATE,
+    'persistence': VALUES_PERSISTENCE_TEMPLATE,
+    'nfs': VALUES_NFS_TEMPLATE,
+    'external_secrets': VALUES_EXTERNAL_SECRETS_TEMPLATE,
+}
 
-def generate_base_deployment(app_config, enabled_addons, addon_config):
-    """Generate deployment with conditional volume mounts"""
-    
-    # Build volume mounts
-    volume_mounts = []
-    volumes = []
-    env_from = []
-    
-    if 'persistence' in enabled_addons:
-        mount_path = addon_config.get('pv_mount_path', '/data')
-        volume_mounts.append(f"""        - name: data
-          mountPath: {mount_path}""")
-        volumes.append(f"""      - name: data
-        persistentVolumeClaim:
-          claimName: {{{{ .Values.webapp.name }}}}-pvc""")
+
+def generate_modular_values(app_config, enabled_addons, addon_config):
+    """Generate values.yaml with only enabled components"""
+    derived = {
+        'nfs_readonly_str': BOOL_STR[bool(addon_config['nfs_readonly'])]
+    }
+    ctx = collections.ChainMap(derived, app_config, addon_config)
     
-    if 'nfs' in enabled_addons:
-        mount_path = addon_config.get('nfs_mount_path', '/mnt/nfs')
-        readonly = addon_config.get('nfs_readonly', False)
-        readonly_str = '\n          readOnly: true' if readonly else ''
-        volume_mounts.append(f"""        - name: nfs
-          mountPath: {mount_path}{readonly_str}""")
-        volumes.append(f"""      - name: nfs
-        persistentVolumeClaim:
-          claimName: {{{{ .Values.webapp.name }}}}-nfs-pvc""")
+    parts = [VALUES_BASE_TEMPLATE.substitute(ctx)]
     
-    if 'external_secrets' in enabled_addons:
-        env_from.append(f"""        - secretRef:
-            name: {{{{ .Values.webapp.name }}}}-external-secret""")
+    # Add ingress config if enabled
+    if app_config['enable_ingress']:
+        parts.append(VALUES_INGRESS_TEMPLATE.substitute(ctx))
     
-    # Build deployment template
-    volume_mounts_str = '\n'.join(volume_mounts) if volume_mounts else ''
-    volumes_str = '\n'.join(volumes) if volumes else ''
-    env_from_str = '\n'.join(env_from) if env_from else ''
+    # Add the config of each enabled add-on
+    parts.extend(
+        template.substitute(ctx) for addon, template in VALUES_ADDON_TEMPLATES.items() if addon in enabled_addons
+    )
     
-    deployment = f"""apiVersion: apps/v1
+    return ''.join(parts)
+
+# Deployment manifest; only the optional blocks are filled in per chart
+DEPLOYMENT_TEMPLATE = Template("""apiVersion: apps/v1
 kind: Deployment
 metadata:
-  name: {{{{ .Values.webapp.name }}}}
-  namespace: {{{{ .Release.Namespace }}}}
+  name: {{ .Values.webapp.name }}
+  namespace: {{ .Release.Namespace }}
   labels:
-    app: {{{{ .Values.webapp.name }}}}
-    group: {{{{ .Values.webapp.group }}}}
+    app: {{ .Values.webapp.name }}
+    group: {{ .Values.webapp.group }}
 spec:
-  replicas: {{{{ .Values.replicaCount }}}}
+  replicas: {{ .Values.replicaCount }}
   selector:
     matchLabels:
-      app: {{{{ .Values.webapp.name }}}}
+      app: {{ .Values.webapp.name }}
   template:
     metadata:
       labels:
-        app: {{{{ .Values.webapp.name }}}}
+        app: {{ .Values.webapp.name }}
     spec:
       containers:
-      - name: {{{{ .Values.webapp.name }}}}
-        image: {{{{ .Values.webapp.container.image }}}}
+      - name: {{ .Values.webapp.name }}
+        image: {{ .Values.webapp.container.image }}
         imagePullPolicy: IfNotPresent
         ports:
-        - containerPort: {{{{ .Values.webapp.container.port }}}}"""
-    
-    if env_from_str:
-        deployment += f"""
-        envFrom:
-{env_from_str}"""
-    
-    deployment += f"""
+        - containerPort: {{ .Values.webapp.container.port }}${env_from_block}
         resources:
           limits:
-            memory: {{{{ .Values.webapp.container.memory }}}}
-            cpu: {{{{ .Values.webapp.container.cpu }}}}
+            memory: {{ .Values.webapp.container.memory }}
+            cpu: {{ .Values.webapp.container.cpu }}
           requests:
             cpu: 100m
-            memory: 128Mi"""
+            memory: 128Mi${volume_mounts_block}${volumes_block}""")
+
+
+# Per-add-on entries for the deployment's volumeMounts, volumes and envFrom lists
+PV_VOLUME_MOUNT_TEMPLATE = Template("""        - name: data
+          mountPath: ${pv_mount_path}""")
+
+PV_VOLUME = """      - name: data
+        persistentVolumeClaim:
+          claimName: {{ .Values.webapp.name }}-pvc"""
+
+NFS_VOLUME_MOUNT_TEMPLATE = Template("""        - name: nfs
+          mountPath: ${nfs_mount_path}""")
+
+NFS_READONLY_MOUNT = """
+          readOnly: true"""
+
+NFS_VOLUME = """      - name: nfs
+        persistentVolumeClaim:
+          claimName: {{ .Values.webapp.name }}-nfs-pvc"""
+
+EXTERNAL_SECRET_ENV_FROM = """        - secretRef:
+            name: {{ .Values.webapp.name }}-external-secret"""
+
+
+def generate_base_deployment(app_config, enabled_addons, addon_config):
+    """Generate deployment with conditional volume mounts"""
+    
+    # Build volume mounts
+    volume_mounts = []
+    volumes = []
+    env_from = []
     
-    if volume_mounts_str:
-        deployment += f"""
-        volumeMounts:
-{volume_mounts_str}"""
+    if 'persistence' in enabled_addons:
+        volume_mounts.append(PV_VOLUME_MOUNT_TEMPLATE.substitute(addon_config))
+        volumes.append(PV_VOLUME)
+    
+    if 'nfs' in enabled_addons:
+        nfs_mount = NFS_VOLUME_MOUNT_TEMPLATE.substitute(addon_config)
+        volume_mounts.append(nfs_mount + NFS_READONLY_MOUNT if addon_config['nfs_readonly'] else nfs_mount)
+        volumes.append(NFS_VOLUME)
     
-    if volumes_str:
-        deployment += f"""
-      volumes:
-{volumes_str}"""
+    if 'external_secrets' in enabled_addons:
+        env_from.append(EXTERNAL_SECRET_ENV_FROM)
     
-    return deployment
+    return DEPLOYMENT_TEMPLATE.substitute(
+        env_from_block='\n        envFrom:\n' + '\n'.join(env_from) if env_from else '',
+        volume_mounts_block='\n        volumeMounts:\n' + '\n'.join(volume_mounts) if volume_mounts else '',
+        volumes_block='\n      volumes:\n' + '\n'.join(volumes) if volumes else ''
+    )
+
 
-def generate_service():
-    """Generate service.yaml"""
-    return f"""apiVersion: v1
+SERVICE_YAML = """apiVersion: v1
 kind: Service
 metadata:
-  name: {{{{ .Values.webapp.name }}}}
-  namespace: {{{{ .Release.Namespace }}}}
+  name: {{ .Values.webapp.name }}
+  namespace: {{ .Release.Namespace }}
   labels:
-    group: {{{{ .Values.webapp.group }}}}
+    group: {{ .Values.webapp.group }}
 spec:
   ports:
-  - port: {{{{ .Values.webapp.container.port }}}}
-    targetPort: {{{{ .Values.webapp.container.port }}}}
+  - port: {{ .Values.webapp.container.port }}
+    targetPort: {{ .Values.webapp.container.port }}
   selector:
-    app: {{{{ .Values.webapp.name }}}}
+    app: {{ .Values.webapp.name }}
 """
 
-def generate_ingress():
-    """Generate ingress.yaml"""
-    return f"""{{{{- if .Values.ingress.enabled -}}}}
+
+INGRESS_YAML = """{{- if .Values.ingress.enabled -}}
 apiVersion: networking.k8s.io/v1
 kind: Ingress
 metadata:
-  name: {{{{ .Values.webapp.name }}}}
-  namespace: {{{{ .Release.Namespace }}}}
+  name: {{ .Values.webapp.name }}
+  namespace: {{ .Release.Namespace }}
   labels:
-    app: {{{{ .Values.webapp.name }}}}
-    group: {{{{ .Values.webapp.group }}}}
+    app: {{ .Values.webapp.name }}
+    group: {{ .Values.webapp.group }}
   annotations:
     cert-manager.io/cluster-issuer: "incommon"
 spec:
-  ingressClassName: nginx-{{{{ .Values.ingress.access }}}}
+  ingressClassName: nginx-{{ .Values.ingress.access }}
   tls:
   - hosts:
-    - {{{{ .Values.webapp.tls.fqdn }}}}
-    secretName: {{{{ .Values.webapp.tls.secretName }}}}
+    - {{ .Values.webapp.tls.fqdn }}
+    secretName: {{ .Values.webapp.tls.secretName }}
   rules:
-  - host: {{{{ .Values.webapp.tls.fqdn }}}}
+  - host: {{ .Values.webapp.tls.fqdn }}
     http:
       paths:
-      - path: {{{{ .Values.webapp.path }}}}
+      - path: {{ .Values.webapp.path }}
         pathType: Prefix
         backend:
           service:
-            name: {{{{ .Values.webapp.name }}}}
+            name: {{ .Values.webapp.name }}
             port:
-              number: {{{{ .Values.webapp.container.port }}}}
-{{{{- end }}}}
+              number: {{ .Values.webapp.container.port }}
+{{- end }}
 """
 
-def generate_cnpg_cluster():
-    """Generate CloudNativePG Cluster"""
-    return f"""{{{{- if .Values.cnpg.enabled }}}}
+
+CNPG_CLUSTER_YAML = """{{- if .Values.cnpg.enabled }}
 apiVersion: postgresql.cnpg.io/v1
 kind: Cluster
 metadata:
-  name: {{{{ .Values.webapp.name }}}}-cnpg
-  namespace: {{{{ .Release.Namespace }}}}
+  name: {{ .Values.webapp.name }}-cnpg
+  namespace: {{ .Release.Namespace }}
   labels:
-    app: {{{{ .Values.webapp.name }}}}
-    group: {{{{ .Values.webapp.group }}}}
+    app: {{ .Values.webapp.name }}
+    group: {{ .Values.webapp.group }}
 spec:
-  instances: {{{{ .Values.cnpg.instances }}}}
+  instances: {{ .Values.cnpg.instances }}
   
   postgresql:
     parameters:
@@ -433,21 +557,20 @@ spec:
       shared_buffers: "256MB"
   
   storage:
-    size: {{{{ .Values.cnpg.storage.size }}}}
+    size: {{ .Values.cnpg.storage.size }}
     storageClass: ceph-kubepv
   
   bootstrap:
     initdb:
-      database: {{{{ .Values.cnpg.appUser.owner }}}}
-      owner: {{{{ .Values.cnpg.appUser.owner }}}}
+      database: {{ .Values.cnpg.appUser.owner }}
+      owner: {{ .Values.cnpg.appUser.owner }}
       secret:
-        name: {{{{ .Values.webapp.name }}}}-app-user
-{{{{- end }}}}
+        name: {{ .Values.webapp.name }}-app-user
+{{- end }}
 """
 
-def generate_cnpg_app_user_secret():
-    """Generate CNPG App User ExternalSecret"""
-    return """{{- if .Values.cnpg.enabled }}
+
+CNPG_APP_USER_SECRET_YAML = """{{- if .Values.cnpg.enabled }}
 apiVersion: external-secrets.io/v1beta1
 kind: ExternalSecret
 metadata:
@@ -473,9 +596,8 @@ spec:
 {{- end }}
 """
 
-def generate_dask_scheduler():
-    """Generate Dask scheduler deployment"""
-    return """{{- if .Values.dask.enabled }}
+
+DASK_SCHEDULER_YAML = """{{- if .Values.dask.enabled }}
 apiVersion: apps/v1
 kind: Deployment
 metadata:
@@ -509,9 +631,7 @@ spec:
 """
 
 
-def generate_dask_scheduler_service():
-    """Generate Dask scheduler service"""
-    return """{{- if .Values.dask.enabled }}
+DASK_SCHEDULER_SERVICE_YAML = """{{- if .Values.dask.enabled }}
 apiVersion: v1
 kind: Service
 metadata:
@@ -535,9 +655,7 @@ spec:
 """
 
 
-def generate_dask_workers():
-    """Generate Dask workers deployment"""
-    return """{{- if .Values.dask.enabled }}
+DASK_WORKERS_YAML = """{{- if .Values.dask.enabled }}
 apiVersion: apps/v1
 kind: Deployment
 metadata:
@@ -576,9 +694,7 @@ spec:
 """
 
 
-def generate_pvc():
-    """Generate PVC for persistent storage"""
-    return """{{- if .Values.persistence.enabled }}
+PVC_YAML = """{{- if .Values.persistence.enabled }}
 apiVersion: v1
 kind: PersistentVolumeClaim
 metadata:
@@ -596,9 +712,7 @@ spec:
 """
 
 
-def generate_nfs_pv():
-    """Generate NFS PersistentVolume"""
-    return """{{- if .Values.nfs.enabled }}
+NFS_PV_YAML = """{{- if .Values.nfs.enabled }}
 apiVersion: v1
 kind: PersistentVolume
 metadata:
@@ -627,9 +741,7 @@ spec:
 """
 
 
-def generate_nfs_pvc():
-    """Generate NFS PersistentVolumeClaim"""
-    return """{{- if .Values.nfs.enabled }}
+NFS_PVC_YAML = """{{- if .Values.nfs.enabled }}
 apiVersion: v1
 kind: PersistentVolumeClaim
 metadata:
@@ -651,9 +763,7 @@ spec:
 """
 
 
-def generate_external_secret():
-    """Generate ExternalSecret"""
-    return """{{- if .Values.externalSecrets.enabled }}
+EXTERNAL_SECRET_YAML = """{{- if .Values.externalSecrets.enabled }}
 apiVersion: external-secrets.io/v1beta1
 kind: ExternalSecret
 metadata:
@@ -675,645 +785,108 @@ spec:
 """
 
 
-def generate_modular_readme(app_config, enabled_addons, addon_config):
-    """Generate comprehensive README with enabled components"""
-    from datetime import datetime
-    
-    app_name = app_config['app_name']
-    image_parts = app_config['image'].rsplit(':', 1)
-    image_repo = image_parts[0]
-    image_tag = image_parts[1] if len(image_parts) > 1 else 'latest'
-    replica_count = app_config['replicas']
-    port = app_config['port']
-    
-    # Ingress info
-    ingress_enabled = app_config['enable_ingress']
-    if ingress_enabled:
-        access_type = app_config.get('ingress_type', 'external')
-        fqdn = app_config['domain']
-        ingress_line = f"- **External Access**: https://{fqdn} ({access_type})"
-    else:
-        ingress_line = ""
-        fqdn = f"{app_name}.k8s.ucar.edu"
-    
-    # Build components list
-    components_list = []
-    
-    if 'cnpg' in enabled_addons:
-        instances = addon_config.get('cnpg_instances', 3)
-        components_list.append(f"- **CloudNativePG**: {instances}-instance PostgreSQL cluster")
-    
-    if 'dask' in enabled_addons:
-        workers = addon_config.get('worker_replicas', 3)
-        components_list.append(f"- **Dask**: Distributed computing cluster with {workers} workers")
-    
-    if 'persistence' in enabled_addons:
-        size = addon_config.get('pv_storage_size', '10Gi')
-        access_mode = addon_config.get('pv_access_mode', 'ReadWriteOnce')
-        access_desc = "single-pod" if access_mode == "ReadWriteOnce" else "multi-pod"
-        components_list.append(f"- **Persistent Volume**: {size} storage ({access_desc} access)")
-    
-    if 'nfs' in enabled_addons:
-        server = addon_config.get('nfs_server', 'nfs.example.com')
-        readonly = addon_config.get('nfs_readonly', False)
-        access = "read-only" if readonly else "read-write"
-        components_list.append(f"- **NFS**: Shared storage from {server} ({access})")
-    
-    if 'external_secrets' in enabled_addons:
-        components_list.append(f"- **External Secrets**: Vault integration")
-    
-    components_text = "\n".join(components_list)
-    
-    readme = f"""# {app_name}
-
-Helm chart for deploying to CIRRUS
-
-## Quick Start
-
-```bash
-# Install
-helm install {app_name} .
-
-# Check status
-kubectl get pods -l app.kubernetes.io/name={app_name}
-```"""
-    
-    if ingress_enabled:
-        readme += f"""
-
-View at: **https://{fqdn}**
-"""
-    
-    readme += f"""
-
-## What's Deployed
-
-- **Application**: {replica_count} replica(s) on port {port}
-{ingress_line}
-"""
-    
-    if components_text:
-        readme += components_text + "\n"
-    
-    readme += f"""
-
-## Configuration
-
-Edit `values.yaml` to customize your deployment.
-
-### Key Settings
-
-```yaml
-replicaCount: {replica_count}  # Recommended: 2+ for zero-downtime during maintenance
-
-webapp:
-  name: {app_name}
-  tls:
-    fqdn: {fqdn}
-  container:
-    image: {image_repo}:{image_tag}
-    port: {port}
-    memory: 1G
-    cpu: 2
-"""
-    
-    if ingress_enabled:
-        readme += f"""
-ingress:
-  enabled: true
-  access: {access_type}  # Switch between 'external' or 'internal'
-"""
-    
-    readme += """```
-
-### Switching Access Type
-
-To change between external (public) and internal (UCAR-only) access, edit `values.yaml`:
-
-```yaml
-ingress:
-  access: internal  # or 'external'
-```
-
-The ingress class is automatically set to `nginx-external` or `nginx-internal`.
-
-"""
-    
-    # Add component-specific config if any major add-ons are enabled
-    if 'cnpg' in enabled_addons:
-        readme += """### Database Connection
-
-CloudNativePG database credentials are automatically managed. Check the pod environment for connection details.
-
-"""
-    
-    if 'nfs' in enabled_addons:
-        readonly = addon_config.get('nfs_readonly', False)
-        if readonly:
-            readme += """### NFS Read-Only Access
-
-NFS volume is mounted read-only. Write operations will fail. For write access, disable the read-only option or use a persistent volume.
-
-"""
-    
-    readme += """## Common Tasks
-
-### Update Application
-
-```bash
-# Edit values.yaml with new image tag
-# Then upgrade:
-helm upgrade {app_name} .
-```
-
-### Scale Replicas
-
-```bash
-# Edit values.yaml and change replicaCount
-helm upgrade {app_name} .
-```
-
-### View Logs
-
-```bash
-kubectl logs -f -l app.kubernetes.io/name={app_name}
-```
-
-### Check Resource Usage
-
-```bash
-kubectl top pods -l app.kubernetes.io/name={app_name}
-```
-
-## Troubleshooting
-
-### Pods Not Starting
-
-```bash
-kubectl describe pod -l app.kubernetes.io/name={app_name}
-kubectl logs -l app.kubernetes.io/name={app_name}
-```
+# Static chart files, UTF-8 encoded once for the ZIP writer and GitHub uploads
+HELPERS_TPL_BYTES = generate_helpers_tpl().encode()
+SERVICE_YAML_BYTES = SERVICE_YAML.encode()
+INGRESS_YAML_BYTES = INGRESS_YAML.encode()
+
+# Chart templates emitted for each enabled add-on, in archive order
+ADDON_TEMPLATES = {
+    'cnpg': (
+        ('templates/cnpg-cluster.yaml', CNPG_CLUSTER_YAML.encode()),
+        ('templates/cnpg-app-user-secret.yaml', CNPG_APP_USER_SECRET_YAML.encode()),
+    ),
+    'dask': (
+        ('templates/dask-scheduler-deployment.yaml', DASK_SCHEDULER_YAML.encode()),
+        ('templates/dask-scheduler-service.yaml', DASK_SCHEDULER_SERVICE_YAML.encode()),
+        ('templates/dask-workers-deployment.yaml', DASK_WORKERS_YAML.encode()),
+    ),
+    'persistence': (
+        ('templates/pvc.yaml', PVC_YAML.encode()),
+    ),
+    'nfs': (
+        ('templates/nfs-pv.yaml', NFS_PV_YAML.encode()),
+        ('templates/nfs-pvc.yaml', NFS_PVC_YAML.encode()),
+    ),
+    'external_secrets': (
+        ('templates/external-secret.yaml', EXTERNAL_SECRET_YAML.encode()),
+    ),
+}
 
-Common causes:
-- Image doesn't exist or isn't accessible
-- Application crashes on startup (check logs)
-- Resource limits too low
 
-### Can't Access Application
+# README template, compiled once; output is Markdown so nothing is autoescaped
+README_ENV = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'helm')),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    # Compiled templates are kept on disk so new worker processes skip recompiling them.
+    # Jinja's default directory is per user, and it refuses one not owned by us with mode 0700
+    bytecode_cache=FileSystemBytecodeCache()
+)
+README_TEMPLATE = README_ENV.get_template('README.md.j2')
 
-- Wait 5-10 minutes for DNS propagation
-- Verify ingress: `kubectl get ingress {app_name}`
-- Check certificate: `kubectl get certificate`
+@functools.lru_cache(maxsize=1)
+def format_date(minute):
+    """Format today's date as YYYY-MM-DD, cached for the given minute"""
+    return datetime.now().strftime('%Y-%m-%d')
 
-## Support
 
-- **CIRRUS Docs**: https://ncar-hpc-docs.readthedocs.io/en/latest/compute-systems/cirrus/
-- **Support**: [Create Jira ticket](https://jira.ucar.edu/secure/CreateIssueDetails!init.jspa?pid=18470&issuetype=10903)
+def generated_date():
+    """Date stamped into generated READMEs, formatted at most once a minute"""
+    return format_date(int(time.time()) // 60)
 
----
 
-*Generated by CIRRUS Helm Chart Generator on {datetime.now().strftime('%Y-%m-%d')}*
-"""
-    
-    return readme
+def generate_modular_readme(app_config, enabled_addons, addon_config):
     """Generate comprehensive README with enabled components"""
-    from datetime import datetime
-    
-    app_name = app_config['app_name']
-    image_parts = app_config['image'].rsplit(':', 1)
-    image_repo = image_parts[0]
-    image_tag = image_parts[1] if len(image_parts) > 1 else 'latest'
-    replica_count = app_config['replicas']
-    port = app_config['port']
+    # The template tests membership once per add-on
+    enabled_addons = frozenset(enabled_addons)
     
-    # Ingress info
-    ingress_enabled = app_config['enable_ingress']
-    if ingress_enabled:
-        access_type = app_config.get('ingress_type', 'external')
+    if app_config['enable_ingress']:
         fqdn = app_config['domain']
-        ingress_info = f"- **Ingress**: External access at https://{fqdn} ({access_type} access)\n"
-    else:
-        ingress_info = ""
-        access_type = "external"
-        fqdn = f"{app_name}.k8s.ucar.edu"
-    
-    # Components info
-    components_list = []
-    components_config = ""
-    
-    if 'autoscaling' in enabled_addons:
-        min_rep = addon_config.get('min_replicas', 2)
-        max_rep = addon_config.get('max_replicas', 10)
-        components_list.append(f"- **Autoscaling**: {min_rep}-{max_rep} replicas based on CPU")
-        components_config += f"""
-### Autoscaling
-```yaml
-autoscaling:
-  enabled: true
-  minReplicas: {min_rep}
-  maxReplicas: {max_rep}
-  targetCPUUtilizationPercentage: {addon_config.get('target_cpu', 80)}
-```
-
-"""
-    
-    if 'postgresql' in enabled_addons:
-        db_name = addon_config.get('db_name', 'app_db')
-        components_list.append(f"- **PostgreSQL**: Database '{db_name}' with persistent storage")
-        components_config += f"""
-### PostgreSQL Database
-```yaml
-postgresql:
-  enabled: true
-  auth:
-    database: {db_name}
-    username: {addon_config.get('db_user', 'app_user')}
-    # Password auto-generated in secret
-  persistence:
-    size: {addon_config.get('postgres_storage_size', '10Gi')}
-```
-
-**Connection from app**: Environment variable `DATABASE_URL` is automatically injected.
-
-"""
-    
-    if 'cnpg' in enabled_addons:
-        instances = addon_config.get('cnpg_instances', 3)
-        components_list.append(f"- **CloudNativePG**: {instances}-instance PostgreSQL cluster with HA")
-        components_config += f"""
-### CloudNativePG Cluster
-```yaml
-cnpg:
-  enabled: true
-  instances: {instances}
-  storage:
-    size: {addon_config.get('cnpg_storage_size', '20Gi')}
-  backup:
-    enabled: {addon_config.get('cnpg_backup_enabled', 'false')}
-```
-
-"""
-    
-    if 'dask' in enabled_addons:
-        workers = addon_config.get('worker_replicas', 3)
-        components_list.append(f"- **Dask Cluster**: 1 scheduler + {workers} workers")
-        components_config += f"""
-### Dask Cluster
-```yaml
-dask:
-  enabled: true
-  worker:
-    replicas: {workers}
-    threads: {addon_config.get('worker_threads', 4)}
-    memory: {addon_config.get('worker_memory', '4Gi')}
-```
-
-**Connect to scheduler**: `{app_name}-dask-scheduler:8786`
-
-"""
-    
-    if 'persistence' in enabled_addons:
-        pv_size = addon_config.get('pv_storage_size', '10Gi')
-        pv_mount = addon_config.get('pv_mount_path', '/data')
-        components_list.append(f"- **Persistent Volume**: {pv_size} mounted at {pv_mount}")
-        components_config += f"""
-### Persistent Volume
-```yaml
-persistence:
-  enabled: true
-  size: {pv_size}
-  mountPath: {pv_mount}
-  storageClass: ceph-kubepv  # ReadWriteOnce
-```
-
-**Data persists** across pod restarts and redeployments.
-
-"""
-    
-    if 'cephfs' in enabled_addons:
-        ceph_size = addon_config.get('cephfs_storage_size', '10Gi')
-        ceph_mount = addon_config.get('cephfs_mount_path', '/mnt/shared')
-        components_list.append(f"- **CephFS**: {ceph_size} shared storage at {ceph_mount}")
-        components_config += f"""
-### CephFS Shared Storage
-```yaml
-cephfs:
-  enabled: true
-  size: {ceph_size}
-  mountPath: {ceph_mount}
-  storageClass: cephfs  # ReadWriteMany
-```
-
-**Shared across all pods** - multiple pods can read/write simultaneously.
-
-"""
-    
-    if 'nfs' in enabled_addons:
-        nfs_server = addon_config.get('nfs_server', 'nfs.example.com')
-        nfs_path = addon_config.get('nfs_path', '/export/data')
-        components_list.append(f"- **NFS**: External mount from {nfs_server}")
-        components_config += f"""
-### NFS Volume
-```yaml
-nfs:
-  enabled: true
-  server: {nfs_server}
-  path: {nfs_path}
-  mountPath: {addon_config.get('nfs_mount_path', '/mnt/nfs')}
-```
-
-"""
-    
-    if 'glade' in enabled_addons:
-        glade_path = addon_config.get('glade_path', '/glade/work/username')
-        components_list.append(f"- **Glade**: Read-only mount of {glade_path}")
-        components_config += f"""
-### Glade Mount
-```yaml
-glade:
-  enabled: true
-  path: {glade_path}
-  mountPath: {addon_config.get('glade_mount_path', '/glade')}
-  readOnly: true
-```
-
-**Read-only access** to NCAR Glade filesystem.
-
-"""
-    
-    if 'external_secrets' in enabled_addons:
-        secret_path = addon_config.get('secret_path', 'secret/data/myapp')
-        components_list.append(f"- **External Secrets**: Vault secrets from {secret_path}")
-        components_config += f"""
-### External Secrets
-```yaml
-externalSecrets:
-  enabled: true
-  secretPath: {secret_path}
-```
-
-**Secrets injected** as environment variables from bao.k8s.ucar.edu.
-
-"""
-    
-    components_info = "\n".join(components_list)
-    if components_info:
-        components_info = "\n" + components_info + "\n"
-    
-    # Generate README
-    readme = f"""# {app_name} - CIRRUS Helm Chart
-
-This Helm chart deploys your application to the CIRRUS Kubernetes platform.
-
-## Quick Start
-
-```bash
-# Install your application
-helm install {app_name} .
-
-# Check deployment status
-kubectl get pods -l app.kubernetes.io/name={app_name}
-"""
-    
-    if ingress_enabled:
-        readme += f"""
-# View your application
-# https://{fqdn}
-"""
-    
-    readme += """```
-
-## What's Included
-
-This chart deploys:
-- **Deployment**: """ + str(replica_count) + """ replica(s) of your application
-- **Service**: Internal service on port """ + str(port) + """
-"""
-    
-    if ingress_info:
-        readme += ingress_info
-    
-    if components_info:
-        readme += components_info
-    
-    readme += f"""
-## Configuration
-
-All configuration is in `values.yaml`. Key settings:
-
-### Replica Count
-```yaml
-replicaCount: {replica_count}  # Number of pod replicas
-```
-
-**Why we recommend 2+ replicas:**
-- **Zero-downtime deployments**: During CIRRUS server maintenance or updates, your application stays available if at least one pod runs on a different node
-- **High availability**: If one pod crashes or the node fails, traffic automatically routes to healthy pods
-- **Load distribution**: Requests are distributed across multiple pods for better performance
-
-**When to use 1 replica:**
-- Development/testing environments
-- Applications that cannot run multiple instances (e.g., using local file storage)
-- Very low-traffic applications where availability isn't critical
-
-Note: If autoscaling is enabled, `replicaCount` sets the initial number of pods before autoscaling takes over.
-
-### Application Settings
-```yaml
-webapp:
-  name: {app_name}
-  group: {app_name}
-  path: /  # URL path - typically / unless your app uses a different base path
-  tls:
-    fqdn: {fqdn}
-    secretName: incommon-cert-{app_name.replace('.k8s.ucar.edu', '') if '.k8s.ucar.edu' in app_name else app_name.split('.')[0]}
-  container:
-    image: {image_repo}:{image_tag}
-    port: {port}
-    memory: 1G  # Memory limit
-    cpu: 2      # CPU limit (2 cores)
-```
-
-### Ingress (External Access)
-"""
-    
-    if ingress_enabled:
-        readme += f"""```yaml
-ingress:
-  enabled: true
-  access: {access_type}  # Switch between 'external' or 'internal'
-  
-  # external: Public internet access (nginx-external)
-  # internal: UCAR network/VPN only (nginx-internal)
-
-webapp:
-  tls:
-    fqdn: {fqdn}
-    secretName: incommon-cert-{fqdn.replace('.k8s.ucar.edu', '') if '.k8s.ucar.edu' in fqdn else fqdn.split('.')[0]}
-```
-
-To **switch between internal and external access**, simply change:
-```yaml
-ingress:
-  access: internal  # Change to 'internal' or 'external'
-```
-
-The chart automatically uses `nginx-external` or `nginx-internal` based on this value.
-"""
     else:
-        readme += """```yaml
-ingress:
-  enabled: false  # Set to true to enable external access
-  access: external  # or 'internal' for UCAR-only access
-
-webapp:
-  tls:
-    fqdn: myapp.k8s.ucar.edu  # Your unique domain
-    secretName: incommon-cert-myapp
-```
-
-To enable ingress, set `enabled: true` and configure your domain.
-"""
-    
-    readme += """
-### Resources
-```yaml
-webapp:
-  container:
-    memory: 1G  # Memory limit
-    cpu: 2      # CPU limit (2 cores)
-```
-
-**Tuning Tips:**
-- Start with defaults (1G memory, 2 CPU) and monitor using `kubectl top pods`
-- Increase if pods are being OOMKilled (Out Of Memory) or CPU throttled
-- Memory: Set based on your application's typical usage + buffer
-- CPU: Set based on peak load requirements
-- Rule of thumb: memory should be ~1.5x typical usage, CPU should handle peak + 30%
-
-"""
-    
-    if components_config:
-        readme += components_config
-    
-    readme += f"""
-## Prerequisites
-
-Before deploying, ensure:
-
-1. **Container image is accessible**
-   ```bash
-   # Test image pull
-   docker pull {image_repo}:{image_tag}
-   ```
-
-2. **Domain is unique** (if using ingress)
-   - Must end in `.k8s.ucar.edu`
-   - Check availability: `curl https://{fqdn}` (should 404 if available)
-
-3. **You have CIRRUS access**
-   - Kubernetes context configured
-   - Namespace access granted
-
-## Installation
-
-### First Time Install
-```bash
-helm install {app_name} .
-```
-
-### Update Existing Deployment
-```bash
-# After editing values.yaml
-helm upgrade {app_name} .
-
-# Force pod restart
-kubectl rollout restart deployment/{app_name}
-```
-
-### Uninstall
-```bash
-helm uninstall {app_name}
-```
-
-## Troubleshooting
-
-### Pods Not Starting
-```bash
-# Check pod status
-kubectl get pods -l app.kubernetes.io/name={app_name}
-
-# View pod logs
-kubectl logs -l app.kubernetes.io/name={app_name}
-
-# Describe pod for events
-kubectl describe pod -l app.kubernetes.io/name={app_name}
-```
-
-Common issues:
-- **ImagePullBackOff**: Image not accessible or doesn't exist
-- **CrashLoopBackOff**: Application is crashing, check logs
-- **Pending**: Resource constraints, check `kubectl describe pod`
-
-### Ingress Not Working
-```bash
-# Check ingress status
-kubectl get ingress {app_name}
-
-# Describe for events
-kubectl describe ingress {app_name}
-```
-
-Common issues:
-- DNS not resolving: Wait 5-10 minutes for DNS propagation
-- Certificate pending: Check cert-manager logs
-- Wrong access type: Verify `ingress.access` value matches your needs
-
-## Monitoring
-
-### View Logs
-```bash
-# Follow logs from all pods
-kubectl logs -f -l app.kubernetes.io/name={app_name}
-```
-
-### Check Resource Usage
-```bash
-# CPU and memory usage
-kubectl top pods -l app.kubernetes.io/name={app_name}
-```
+        fqdn = app_config['app_name'] + K8S_DOMAIN
+    
+    return README_TEMPLATE.render(
+        app_config,
+        fqdn=fqdn,
+        enabled_addons=enabled_addons,
+        addon_config=addon_config,
+        generated_date=generated_date()
+    )
 
-## Support
 
-For issues or questions:
-- Create a ticket in [CIRRUS Jira](https://jira.ucar.edu/secure/CreateIssueDetails!init.jspa?pid=18470&issuetype=10903)
-- Email: cirrus-support@ucar.edu
-- Documentation: https://ncar-hpc-docs.readthedocs.io/en/latest/compute-systems/cirrus/
+class ZipStream:
+    """Write-only file object that queues ZIP output until it is drained"""
 
-## Chart Information
+    def __init__(self):
+        self.chunks = collections.deque()
 
-- **Chart Version**: 0.1.0
-- **Generated**: {datetime.now().strftime('%Y-%m-%d')}
-- **Generated By**: CIRRUS Modular Helm Chart Generator
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
 
----
+    def flush(self):
+        pass
 
-*This chart was generated based on your selections. Edit `values.yaml` to enable/disable components or adjust configuration.*
-"""
-    
-    return readme
+    def drain(self):
+        while self.chunks:
+            yield self.chunks.popleft()
 
 
 def create_zip(files, app_name):
-    """Create ZIP file"""
-    zip_buffer = io.BytesIO()
+    """Create ZIP file, yielding the archive in chunks as each file is added"""
+    stream = ZipStream()
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for filepath, content in files.items():
+    # The chart is a handful of small text files, so compressing them costs more than it saves
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as zip_file:
+        for filepath, content in files:
             zip_file.writestr(f"{app_name}/{filepath}", content)
+            yield from stream.drain()
     
-    zip_buffer.seek(0)
-    return zip_buffer
+    # Central directory written on close
+    yield from stream.drain()
 
 
 def create_github_pr(token, repo_url, base_branch, files, app_config, enabled_addons):
@@ -1326,35 +899,27 @@ def create_github_pr(token, repo_url, base_branch, files, app_config, enabled_ad
     else:
         raise ValueError("Invalid GitHub repository URL")
     
-    g = Github(token)
+    # A lazy repo skips the GET /repos lookup; only GitHub's pacing between writes is kept
+    g = Github(token, lazy=True, seconds_between_requests=None)
     repo = g.get_repo(repo_path)
     
     app_name = app_config['app_name']
     new_branch = f"add-helm-chart-{app_name}"
     
+    # Commit every chart file in one tree on top of the base branch, then point the new branch at it
     base_ref = repo.get_git_ref(f"heads/{base_branch}")
-    repo.create_git_ref(f"refs/heads/{new_branch}", base_ref.object.sha)
-    
-    for filepath, content in files.items():
-        full_path = f"helm/{app_name}/{filepath}"
-        try:
-            existing_file = repo.get_contents(full_path, ref=new_branch)
-            repo.update_file(
-                full_path,
-                f"Update {filepath}",
-                content,
-                existing_file.sha,
-                branch=new_branch
-            )
-        except GithubException:
-            repo.create_file(
-                full_path,
-                f"Add {filepath}",
-                content,
-                branch=new_branch
-            )
+    base_commit = repo.get_git_commit(base_ref.object.sha)
+    tree = repo.create_git_tree(
+        [
+            InputGitTreeElement(f"helm/{app_name}/{filepath}", '100644', 'blob', content=content.decode())
+            for filepath, content in files
+        ],
+        base_commit.tree
+    )
+    commit = repo.create_git_commit(f"Add modular Helm chart for {app_name}", tree, [base_commit])
+    repo.create_git_ref(f"refs/heads/{new_branch}", commit.sha)
     
-    addons_str = ", ".join([AVAILABLE_ADDONS[a]['name'] for a in enabled_addons]) if enabled_addons else "None"
+    addons_str = ", ".join(ADDON_NAMES[a] for a in enabled_addons) if enabled_addons else "None"
     
     pr = repo.create_pull(
         title=f"Add modular Helm chart for {app_name}",